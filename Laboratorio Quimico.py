@@ -7,8 +7,35 @@ un laboratorio científico, incluyendo reactivos, recetas y experimentos.
 
 import os
 import json
+import pickle
+import re
+import sys
 import time
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# Mismo formato que acepta strptime con "%Y-%m-%d" (mes y día de 1 o 2 dígitos)
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(date_str):
+    """
+    Convierte una fecha YYYY-MM-DD en un objeto date.
+    
+    Las mismas fechas se repiten mucho (vencimientos, registros del
+    mismo día), así que el resultado se guarda en caché. Lanza
+    ValueError si el formato o la fecha no son válidos.
+    """
+    match = _DATE_RE.fullmatch(date_str)
+    if match is None:
+        raise ValueError(f"Fecha no válida: {date_str!r}")
+    
+    # date() comprueba los rangos de mes y día (incluidos años bisiestos)
+    year, month, day = map(int, match.groups())
+    return date(year, month, day)
+
 
 # Clases principales del sistema
 
@@ -16,8 +43,19 @@ class Validator:
     """Clase para validar datos de entrada"""
     
     @staticmethod
-    def validate_string(value, field_name):
-        """Valida que un valor sea una cadena no vacía."""
+    def validate_string(value, field_name, trusted=False):
+        """
+        Valida que un valor sea una cadena no vacía.
+        
+        Con trusted=True solo se comprueba el tipo y que no esté vacía,
+        sin recorrer la cadena con strip(); pensado para datos que ya
+        fueron validados al crearse (por ejemplo, al cargar un archivo).
+        """
+        if trusted:
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"{field_name} debe ser una cadena no vacía")
+            return value
+        
         if not isinstance(value, str) or not value.strip():
             raise ValueError(f"{field_name} debe ser una cadena no vacía")
         return value.strip()
@@ -40,7 +78,7 @@ class Validator:
             return None
         
         try:
-            datetime.strptime(date_str, "%Y-%m-%d")
+            _parse_date(date_str)
             return date_str
         except ValueError:
             raise ValueError(f"{field_name} debe tener el formato YYYY-MM-DD (ejemplo: 2023-12-31)")
@@ -49,19 +87,28 @@ class Validator:
 class Reagent:
     """Clase que representa un reactivo en el laboratorio."""
     
+    __slots__ = (
+        "name", "description", "cost", "category", "inventory", "unit",
+        "min_threshold", "_expiry_date", "_expiry_date_obj", "location",
+        "safety_info", "purchase_history", "usage_history", "orders"
+    )
+    
     def __init__(self, name, description, cost, category, inventory, unit, 
                  min_threshold, expiry_date=None, location="Almacén general", 
                  safety_info=None):
         """Inicializa un nuevo reactivo."""
-        self.name = Validator.validate_string(name, "Nombre")
+        # El nombre se usa como clave en varios diccionarios del sistema
+        self.name = sys.intern(Validator.validate_string(name, "Nombre"))
         self.description = Validator.validate_string(description, "Descripción")
         self.cost = Validator.validate_positive_number(cost, "Costo")
-        self.category = Validator.validate_string(category, "Categoría")
+        # Categorías, unidades y ubicaciones se repiten mucho: se comparte
+        # una sola cadena por valor
+        self.category = sys.intern(Validator.validate_string(category, "Categoría"))
         self.inventory = Validator.validate_positive_number(inventory, "Inventario")
-        self.unit = Validator.validate_string(unit, "Unidad")
+        self.unit = sys.intern(Validator.validate_string(unit, "Unidad"))
         self.min_threshold = Validator.validate_positive_number(min_threshold, "Umbral mínimo")
-        self.expiry_date = Validator.validate_date_format(expiry_date, "Fecha de vencimiento")
-        self.location = Validator.validate_string(location, "Ubicación")
+        self.expiry_date = expiry_date
+        self.location = sys.intern(Validator.validate_string(location, "Ubicación"))
         self.safety_info = safety_info or {}
         self.purchase_history = []
         self.usage_history = []
@@ -71,42 +118,57 @@ class Reagent:
         """Verifica si el reactivo está por debajo del umbral mínimo."""
         return self.inventory <= self.min_threshold
     
-    def is_expired(self):
-        """Verifica si el reactivo está vencido."""
-        if not self.expiry_date:
+    @property
+    def expiry_date(self):
+        """Fecha de vencimiento en formato YYYY-MM-DD (o None)."""
+        return self._expiry_date
+    
+    @expiry_date.setter
+    def expiry_date(self, value):
+        """Valida la fecha y guarda también su versión ya interpretada."""
+        self._expiry_date = Validator.validate_date_format(value, "Fecha de vencimiento")
+        # Se interpreta una sola vez para no repetir strptime en cada consulta
+        self._expiry_date_obj = _parse_date(self._expiry_date) if self._expiry_date else None
+    
+    def is_expired(self, today=None):
+        """
+        Verifica si el reactivo está vencido.
+        
+        Args:
+            today: Fecha de referencia; permite reutilizar la misma en
+                recorridos sobre muchos reactivos (por defecto, hoy)
+        """
+        if self._expiry_date_obj is None:
             return False
         
-        today = datetime.now().date()
-        expiry = datetime.strptime(self.expiry_date, "%Y-%m-%d").date()
-        return today >= expiry
+        return (today or date.today()) >= self._expiry_date_obj
     
-    def days_until_expiry(self):
+    def days_until_expiry(self, today=None):
         """Calcula los días hasta la fecha de vencimiento."""
-        if not self.expiry_date:
+        if self._expiry_date_obj is None:
             return None
         
-        today = datetime.now().date()
-        expiry = datetime.strptime(self.expiry_date, "%Y-%m-%d").date()
-        
-        if today >= expiry:
+        today = today or date.today()
+        if today >= self._expiry_date_obj:
             return 0
         
-        return (expiry - today).days
+        return (self._expiry_date_obj - today).days
     
-    def update_inventory(self, amount, reason):
+    def update_inventory(self, amount, reason, today=None):
         """
         Actualiza el inventario del reactivo.
         
         Args:
             amount: Cantidad a añadir (positivo) o restar (negativo)
             reason: Razón del cambio
+            today: Fecha de la transacción (por defecto, hoy)
         """
         old_inventory = self.inventory
         self.inventory += amount
         
         # Registrar la transacción
         transaction = {
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "date": (today or date.today()).isoformat(),
             "amount": amount,
             "old_level": old_inventory,
             "new_level": self.inventory,
@@ -137,28 +199,36 @@ class Reagent:
             "safety_info": self.safety_info,
             "purchase_history": self.purchase_history,
             "usage_history": self.usage_history,
-            "orders": self.orders if hasattr(self, "orders") else []
+            "orders": self.orders
         }
     
     @classmethod
     def from_dict(cls, data):
-        """Crea un reactivo a partir de un diccionario."""
-        reagent = cls(
-            name=data["name"],
-            description=data["description"],
-            cost=data["cost"],
-            category=data["category"],
-            inventory=data["inventory"],
-            unit=data["unit"],
-            min_threshold=data["min_threshold"],
-            expiry_date=data.get("expiry_date"),
-            location=data.get("location", "Almacén general"),
-            safety_info=data.get("safety_info", {})
-        )
+        """
+        Crea un reactivo a partir de un diccionario.
+        
+        Los datos provienen de to_dict, por lo que las cadenas ya fueron
+        normalizadas: se validan en modo confiable sin pasar por __init__.
+        """
+        reagent = cls.__new__(cls)
+        reagent.name = sys.intern(Validator.validate_string(data["name"], "Nombre", trusted=True))
+        reagent.description = Validator.validate_string(data["description"], "Descripción", trusted=True)
+        reagent.cost = Validator.validate_positive_number(data["cost"], "Costo")
+        reagent.category = sys.intern(Validator.validate_string(data["category"], "Categoría", trusted=True))
+        reagent.inventory = Validator.validate_positive_number(data["inventory"], "Inventario")
+        reagent.unit = sys.intern(Validator.validate_string(data["unit"], "Unidad", trusted=True))
+        reagent.min_threshold = Validator.validate_positive_number(data["min_threshold"], "Umbral mínimo")
+        reagent.expiry_date = data.get("expiry_date")
+        reagent.location = sys.intern(Validator.validate_string(
+            data.get("location", "Almacén general"), "Ubicación", trusted=True
+        ))
+        reagent.safety_info = data.get("safety_info") or {}
         
         reagent.purchase_history = data.get("purchase_history", [])
         reagent.usage_history = data.get("usage_history", [])
         reagent.orders = data.get("orders", [])
+        for order in reagent.orders:
+            order["reagent_name"] = sys.intern(order["reagent_name"])
         
         return reagent
 
@@ -166,14 +236,21 @@ class Reagent:
 class Recipe:
     """Clase que representa una receta para un experimento."""
     
+    __slots__ = (
+        "name", "objective", "reagents", "expected_results", "procedure"
+    )
+    
     def __init__(self, name, objective, reagents, expected_results, procedure=None):
         """Inicializa una nueva receta."""
-        self.name = Validator.validate_string(name, "Nombre")
+        self.name = sys.intern(Validator.validate_string(name, "Nombre"))
         self.objective = Validator.validate_string(objective, "Objetivo")
         
         if not isinstance(reagents, dict) or not reagents:
             raise ValueError("Reactivos debe ser un diccionario no vacío")
-        self.reagents = reagents
+        # Compartir las cadenas de nombres con las claves de LaboratorySystem.reagents
+        self.reagents = {
+            sys.intern(k) if isinstance(k, str) else k: v for k, v in reagents.items()
+        }
         
         if not isinstance(expected_results, dict) or not expected_results:
             raise ValueError("Resultados esperados debe ser un diccionario no vacío")
@@ -191,12 +268,14 @@ class Recipe:
         Returns:
             bool: True si hay suficientes reactivos, False en caso contrario
         """
+        # Comprobar de una vez que todos los reactivos existen
+        if not self.reagents.keys() <= available_reagents.keys():
+            return False
+        
+        today = date.today()
         for reagent_name, amount in self.reagents.items():
-            if reagent_name not in available_reagents:
-                return False
-            
             reagent = available_reagents[reagent_name]
-            if reagent.inventory < amount or reagent.is_expired():
+            if reagent.inventory < amount or reagent.is_expired(today):
                 return False
         
         return True
@@ -257,6 +336,11 @@ class Recipe:
 class Experiment:
     """Clase que representa un experimento realizado."""
     
+    __slots__ = (
+        "recipe", "date", "responsible_people", "results",
+        "measurement_validations", "success", "cost", "notes"
+    )
+    
     def __init__(self, recipe, responsible_people):
         """Inicializa un nuevo experimento."""
         self.recipe = recipe
@@ -321,7 +405,7 @@ class Experiment:
         """Convierte el experimento a un diccionario."""
         return {
             "recipe": self.recipe.to_dict(),
-            "date": self.date.strftime("%Y-%m-%d"),
+            "date": self.date.date().isoformat(),
             "responsible_people": self.responsible_people,
             "results": self.results,
             "measurement_validations": self.measurement_validations,
@@ -337,9 +421,10 @@ class Experiment:
         Nota: Requiere que la receta ya esté cargada.
         """
         recipe = Recipe.from_dict(data["recipe"])
-        experiment = cls(recipe, data["responsible_people"])
+        experiment = cls(recipe, [sys.intern(p) for p in data["responsible_people"]])
         
-        experiment.date = datetime.strptime(data["date"], "%Y-%m-%d")
+        # Las fechas se repiten mucho entre experimentos: se reutiliza la caché
+        experiment.date = datetime.combine(_parse_date(data["date"]), datetime.min.time())
         experiment.results = data["results"]
         experiment.measurement_validations = data["measurement_validations"]
         experiment.success = data["success"]
@@ -360,6 +445,9 @@ class LaboratorySystem:
         self.experiments = []  # Lista de experimentos
         self.suppliers = {}  # Diccionario de proveedores
         self.researchers = {}  # Diccionario de investigadores
+        self._orders_by_id = {}  # Índice order_id -> [(reactivo, pedido), ...]
+        self._order_counter = 0  # Garantiza IDs de pedido únicos
+        self._categories = Counter()  # Reactivos por categoría
         
         # Crear directorio para visualizaciones y datos
         os.makedirs("plots", exist_ok=True)
@@ -367,9 +455,75 @@ class LaboratorySystem:
     
     def add_reagent(self, reagent):
         """Añade un reactivo al sistema."""
+        previous = self.reagents.get(reagent.name)
+        if previous is not None:
+            self._unindex_reagent(previous)
+        
         self.reagents[reagent.name] = reagent
+        self._index_orders(reagent)
+        self._categories[reagent.category] += 1
         return f"Reactivo añadido: {reagent.name}"
     
+    def remove_reagent(self, reagent_name):
+        """Elimina un reactivo del sistema y de las asociaciones con proveedores."""
+        reagent = self.reagents.pop(reagent_name, None)
+        if reagent is None:
+            return f"Error: Reactivo '{reagent_name}' no encontrado"
+        
+        self._unindex_reagent(reagent)
+        for supplier in self.suppliers.values():
+            supplier["reagents"].discard(reagent_name)
+        return f"Reactivo eliminado: {reagent_name}"
+    
+    def _unindex_reagent(self, reagent):
+        """Quita un reactivo de los índices auxiliares del sistema."""
+        for order in reagent.orders:
+            entries = self._orders_by_id.get(order["order_id"])
+            if entries is None:
+                continue
+            entries = [entry for entry in entries if entry[0] is not reagent]
+            if entries:
+                self._orders_by_id[order["order_id"]] = entries
+            else:
+                del self._orders_by_id[order["order_id"]]
+        
+        self._categories[reagent.category] -= 1
+        if self._categories[reagent.category] <= 0:
+            del self._categories[reagent.category]
+    
+    def update_stock_batch(self, deltas, reason):
+        """
+        Aplica varios movimientos de inventario con un mismo motivo.
+        
+        Todos los reactivos se comprueban antes de modificar ninguno, de
+        modo que un nombre desconocido no deja el lote a medias.
+        
+        Args:
+            deltas: Diccionario nombre de reactivo -> cantidad (+/-)
+            reason: Razón del cambio
+        """
+        pairs = []
+        for reagent_name, amount in deltas.items():
+            reagent = self.reagents.get(reagent_name)
+            if reagent is None:
+                return f"Error: Reactivo '{reagent_name}' no encontrado"
+            pairs.append((reagent, amount))
+        
+        today = date.today()
+        for reagent, amount in pairs:
+            reagent.update_inventory(amount, reason, today)
+        return f"Inventario actualizado: {len(pairs)} reactivos"
+    
+    def _index_orders(self, reagent):
+        """
+        Registra los pedidos de un reactivo en el índice por ID.
+        
+        Los archivos antiguos pueden repetir un mismo ID para pedidos hechos
+        en el mismo segundo, por eso cada ID guarda una lista de pedidos.
+        """
+        for order in reagent.orders:
+            self._orders_by_id.setdefault(order["order_id"], []).append((reagent, order))
+    
     def add_recipe(self, recipe):
         """Añade una receta al sistema."""
         self.recipes[recipe.name] = recipe
@@ -382,40 +536,47 @@ class LaboratorySystem:
         
         recipe = self.recipes[recipe_name]
         
-        # Verificar disponibilidad de reactivos
+        # Verificar disponibilidad de reactivos, resolviendo cada uno una sola vez
+        today = date.today()
+        pairs = []
         for reagent_name, amount in recipe.reagents.items():
-            if reagent_name not in self.reagents:
+            reagent = self.reagents.get(reagent_name)
+            if reagent is None:
                 return f"Error: Reactivo '{reagent_name}' no disponible"
             
-            reagent = self.reagents[reagent_name]
             if reagent.inventory < amount:
                 return f"Error: Inventario insuficiente de '{reagent_name}'"
             
-            if reagent.is_expired():
+            if reagent.is_expired(today):
                 return f"Error: Reactivo '{reagent_name}' vencido"
-        
-        # Crear experimento
+            
+            pairs.append((reagent, amount))
+        
+        # Crear experimento (los nombres se internan al registrarse)
+        if isinstance(responsible_people, list):
+            responsible_people = [
+                sys.intern(person) if isinstance(person, str) else person
+                for person in responsible_people
+            ]
         experiment = Experiment(recipe, responsible_people)
         experiment.notes = notes
         
         # Registrar resultados
         for measurement, value in measurements.items():
+            if isinstance(measurement, str):
+                measurement = sys.intern(measurement)
             experiment.record_result(measurement, value)
         
         # Validar resultados
         experiment.success = experiment.validate_results()
         
-        # Actualizar inventario
-        for reagent_name, amount in recipe.reagents.items():
-            self.reagents[reagent_name].update_inventory(
-                -amount, f"Usado en experimento: {recipe_name}"
-            )
-        
-        # Calcular costo
-        experiment.cost = sum(
-            self.reagents[reagent_name].cost * amount
-            for reagent_name, amount in recipe.reagents.items()
-        )
+        # Actualizar inventario y calcular costo en el mismo recorrido
+        reason = f"Usado en experimento: {recipe_name}"
+        cost = 0.0
+        for reagent, amount in pairs:
+            reagent.update_inventory(-amount, reason, today)
+            cost += reagent.cost * amount
+        experiment.cost = cost
         
         # Añadir a la lista de experimentos
         self.experiments.append(experiment)
@@ -430,7 +591,7 @@ class LaboratorySystem:
         self.suppliers[name] = {
             "name": name,
             "contact_info": contact_info,
-            "reagents": []
+            "reagents": set()
         }
         return f"Proveedor añadido: {name}"
     
@@ -442,11 +603,12 @@ class LaboratorySystem:
         if reagent_name not in self.reagents:
             return f"Error: Reactivo '{reagent_name}' no encontrado"
         
-        if reagent_name not in self.suppliers[supplier_name]["reagents"]:
-            self.suppliers[supplier_name]["reagents"].append(reagent_name)
-            return f"Reactivo '{reagent_name}' asociado con proveedor '{supplier_name}'"
+        supplier_reagents = self.suppliers[supplier_name]["reagents"]
+        if reagent_name in supplier_reagents:
+            return f"El reactivo '{reagent_name}' ya está asociado con el proveedor '{supplier_name}'"
         
-        return f"El reactivo '{reagent_name}' ya está asociado con el proveedor '{supplier_name}'"
+        supplier_reagents.add(reagent_name)
+        return f"Reactivo '{reagent_name}' asociado con proveedor '{supplier_name}'"
     
     def place_order(self, reagent_name, quantity, supplier_name):
         """Registra un pedido de reactivo."""
@@ -456,18 +618,24 @@ class LaboratorySystem:
         if supplier_name not in self.suppliers:
             return f"Error: Proveedor '{supplier_name}' no encontrado"
         
+        now = datetime.now()
+        self._order_counter += 1
+        
         order = {
-            "order_id": f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "order_id": f"ORD-{now.strftime('%Y%m%d%H%M%S')}-{self._order_counter:06d}",
             "reagent_name": reagent_name,
             "quantity": quantity,
             "supplier_name": supplier_name,
-            "order_date": datetime.now().strftime("%Y-%m-%d"),
+            "order_date": now.date().isoformat(),
             "status": "pendiente",
-            "expected_delivery": (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+            "expected_delivery": (now.date() + timedelta(days=7)).isoformat()
         }
         
         # Añadir a historial de pedidos del reactivo
         self.reagents[reagent_name].orders.append(order)
+        self._orders_by_id.setdefault(order["order_id"], []).append(
+            (self.reagents[reagent_name], order)
+        )
         
         result = f"Pedido registrado: {order['order_id']}\n"
         result += f"Reactivo: {reagent_name}, Cantidad: {quantity}, Proveedor: {supplier_name}"
@@ -476,26 +644,27 @@ class LaboratorySystem:
     
     def receive_order(self, order_id):
         """Registra la recepción de un pedido."""
-        # Buscar el pedido en todos los reactivos
-        for reagent_name, reagent in self.reagents.items():
-            for order in reagent.orders:
-                if order["order_id"] == order_id and order["status"] == "pendiente":
-                    order["status"] = "recibido"
-                    order["received_date"] = datetime.now().strftime("%Y-%m-%d")
-                    
-                    # Actualizar inventario
-                    reagent.update_inventory(
-                        order["quantity"],
-                        f"Recepción de pedido {order_id}"
-                    )
-                    
-                    result = f"Pedido recibido: {order_id}\n"
-                    result += f"Reactivo: {reagent_name}, Cantidad: {order['quantity']}\n"
-                    result += f"Nuevo inventario: {reagent.inventory} {reagent.unit}"
-                    
-                    return result
-        
-        return f"Error: Pedido '{order_id}' no encontrado o no pendiente"
+        # Con IDs repetidos se recibe el primer pedido aún pendiente
+        for reagent, order in self._orders_by_id.get(order_id, ()):
+            if order["status"] == "pendiente":
+                break
+        else:
+            return f"Error: Pedido '{order_id}' no encontrado o no pendiente"
+        
+        order["status"] = "recibido"
+        order["received_date"] = date.today().isoformat()
+        
+        # Actualizar inventario
+        reagent.update_inventory(
+            order["quantity"],
+            f"Recepción de pedido {order_id}"
+        )
+        
+        result = f"Pedido recibido: {order_id}\n"
+        result += f"Reactivo: {reagent.name}, Cantidad: {order['quantity']}\n"
+        result += f"Nuevo inventario: {reagent.inventory} {reagent.unit}"
+        
+        return result
     
     def get_low_stock_reagents(self):
         """Obtiene la lista de reactivos con bajo stock."""
@@ -504,20 +673,32 @@ class LaboratorySystem:
     
     def get_expired_reagents(self):
         """Obtiene la lista de reactivos vencidos."""
-        expired = [r for r in self.reagents.values() if r.is_expired()]
+        today = date.today()
+        expired = [r for r in self.reagents.values() if r.is_expired(today)]
         return expired
     
     def get_inventory_report(self):
         """Genera un informe de inventario."""
-        total_value = sum(r.inventory * r.cost for r in self.reagents.values())
-        categories = set(r.category for r in self.reagents.values())
+        total_value = 0.0
+        low_stock_count = 0
+        expired_count = 0
+        today = date.today()
+        
+        # Un único recorrido en lugar de uno por cada métrica
+        for reagent in self.reagents.values():
+            total_value += reagent.inventory * reagent.cost
+            if reagent.is_low_stock():
+                low_stock_count += 1
+            if reagent.is_expired(today):
+                expired_count += 1
         
         report = {
             "total_reagents": len(self.reagents),
             "total_value": total_value,
-            "categories": list(categories),
-            "low_stock_count": len(self.get_low_stock_reagents()),
-            "expired_count": len(self.get_expired_reagents())
+            "categories": list(self._categories),
+            "category_counts": dict(self._categories),
+            "low_stock_count": low_stock_count,
+            "expired_count": expired_count
         }
         
         return report
@@ -533,8 +714,14 @@ class LaboratorySystem:
             }
         
         total = len(self.experiments)
-        successful = sum(1 for e in self.experiments if e.success)
-        total_cost = sum(e.cost for e in self.experiments)
+        successful = 0
+        total_cost = 0.0
+        
+        # Un solo recorrido para contar éxitos y acumular costos
+        for experiment in self.experiments:
+            if experiment.success:
+                successful += 1
+            total_cost += experiment.cost
         
         stats = {
             "total_experiments": total,
@@ -545,8 +732,21 @@ class LaboratorySystem:
         
         return stats
     
-    def save_data(self, filename="data/laboratory_data.json"):
-        """Guarda los datos del sistema en un archivo JSON."""
+    def save_data(self, filename="data/laboratory_data.json", pretty=False):
+        """
+        Guarda los datos del sistema en un archivo JSON.
+        
+        Args:
+            filename: Ruta del archivo de destino
+            pretty: Si es True, indenta el JSON para facilitar su lectura
+        """
+        if not pretty:
+            # Escribir objeto por objeto, sin armar el documento completo en memoria
+            with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.writelines(self._iter_json_chunks())
+            
+            return f"Datos guardados en: {filename}"
+        
         data = {
             "reagents": {
                 name: reagent.to_dict()
@@ -560,21 +760,53 @@ class LaboratorySystem:
                 experiment.to_dict()
                 for experiment in self.experiments
             ],
-            "suppliers": self.suppliers
+            "suppliers": {
+                name: {**supplier, "reagents": sorted(supplier["reagents"])}
+                for name, supplier in self.suppliers.items()
+            }
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        # Codificar todo de una vez y escribirlo con una sola llamada
+        content = json.dumps(data, ensure_ascii=False, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(content.encode('utf-8'))
         
         return f"Datos guardados en: {filename}"
     
+    def _iter_json_chunks(self):
+        """
+        Genera el JSON compacto del sistema por partes.
+        
+        Produce el mismo documento que save_data con pretty=True, pero
+        sin indentar y codificando un reactivo, receta o experimento a la vez.
+        """
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        
+        def members(items):
+            for i, (key, value) in enumerate(items):
+                yield ("," if i else "") + encode(key) + ":" + encode(value.to_dict())
+        
+        yield '{"reagents":{'
+        yield from members(self.reagents.items())
+        yield '},"recipes":{'
+        yield from members(self.recipes.items())
+        yield '},"experiments":['
+        for i, experiment in enumerate(self.experiments):
+            yield ("," if i else "") + encode(experiment.to_dict())
+        yield '],"suppliers":'
+        yield encode({
+            name: {**supplier, "reagents": sorted(supplier["reagents"])}
+            for name, supplier in self.suppliers.items()
+        })
+        yield '}'
+    
     def load_data(self, filename="data/laboratory_data.json"):
         """Carga los datos del sistema desde un archivo JSON."""
         if not os.path.exists(filename):
             return f"Archivo no encontrado: {filename}"
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = json.loads(f.read())
         
         # Cargar reactivos
         self.reagents = {
@@ -582,6 +814,13 @@ class LaboratorySystem:
             for name, reagent_data in data["reagents"].items()
         }
         
+        # Reconstruir el índice de pedidos
+        self._orders_by_id = {}
+        for reagent in self.reagents.values():
+            self._index_orders(reagent)
+        self._order_counter = sum(len(entries) for entries in self._orders_by_id.values())
+        self._categories = Counter(r.category for r in self.reagents.values())
+        
         # Cargar recetas
         self.recipes = {
             name: Recipe.from_dict(recipe_data)
@@ -589,13 +828,50 @@ class LaboratorySystem:
         }
         
         # Cargar experimentos
-        self.experiments = []
-        for experiment_data in data["experiments"]:
-            experiment = Experiment.from_dict(experiment_data)
-            self.experiments.append(experiment)
+        self.experiments = [
+            Experiment.from_dict(experiment_data)
+            for experiment_data in data["experiments"]
+        ]
         
         # Cargar proveedores
-        self.suppliers = data.get("suppliers", {})
+        self.suppliers = {
+            name: {**supplier, "reagents": set(supplier.get("reagents", []))}
+            for name, supplier in data.get("suppliers", {}).items()
+        }
+        
+        result = f"Datos cargados desde: {filename}\n"
+        result += f"Reactivos: {len(self.reagents)}\n"
+        result += f"Recetas: {len(self.recipes)}\n"
+        result += f"Experimentos: {len(self.experiments)}"
+        
+        return result
+    
+    def save_binary(self, filename="data/laboratory_data.pkl"):
+        """
+        Guarda el estado completo del sistema en formato binario (pickle).
+        
+        Evita convertir cada objeto a diccionario; pensado como formato
+        interno y rápido. Para un archivo legible usar save_data.
+        """
+        with open(filename, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        return f"Datos guardados en: {filename}"
+    
+    def load_binary(self, filename="data/laboratory_data.pkl"):
+        """
+        Carga el estado del sistema desde un archivo creado con save_binary.
+        
+        Nota: pickle puede ejecutar código al cargar; usar solo con
+        archivos generados por este mismo programa.
+        """
+        if not os.path.exists(filename):
+            return f"Archivo no encontrado: {filename}"
+        
+        with open(filename, 'rb') as f:
+            loaded = pickle.load(f)
+        
+        self.__dict__.update(loaded.__dict__)
         
         result = f"Datos cargados desde: {filename}\n"
         result += f"Reactivos: {len(self.reagents)}\n"
@@ -627,7 +903,7 @@ class LaboratorySystem:
                 "inventory": 2000,
                 "unit": "mL",
                 "min_threshold": 500,
-                "expiry_date": (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d"),
+                "expiry_date": (date.today() + timedelta(days=365)).isoformat(),
                 "location": "Almacén de ácidos",
                 "safety_info": "Corrosivo. Usar guantes y gafas de protección.",
                 "supplier": "Sigma-Aldrich"
@@ -640,7 +916,7 @@ class LaboratorySystem:
                 "inventory": 1500,
                 "unit": "g",
                 "min_threshold": 300,
-                "expiry_date": (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%d"),
+                "expiry_date": (date.today() + timedelta(days=730)).isoformat(),
                 "location": "Almacén de bases",
                 "safety_info": "Corrosivo. Evitar contacto con piel y ojos.",
                 "supplier": "Merck"
@@ -653,7 +929,7 @@ class LaboratorySystem:
                 "inventory": 5000,
                 "unit": "mL",
                 "min_threshold": 1000,
-                "expiry_date": (datetime.now() + timedelta(days=500)).strftime("%Y-%m-%d"),
+                "expiry_date": (date.today() + timedelta(days=500)).isoformat(),
                 "location": "Almacén de solventes",
                 "safety_info": "Inflamable. Mantener alejado de fuentes de calor.",
                 "supplier": "Fisher Scientific"
@@ -666,7 +942,7 @@ class LaboratorySystem:
                 "inventory": 3000,
                 "unit": "g",
                 "min_threshold": 500,
-                "expiry_date": (datetime.now() + timedelta(days=1825)).strftime("%Y-%m-%d"),
+                "expiry_date": (date.today() + timedelta(days=1825)).isoformat(),
                 "location": "Almacén general",
                 "safety_info": "No tóxico. Sin precauciones especiales.",
                 "supplier": "VWR International"
@@ -679,7 +955,7 @@ class LaboratorySystem:
                 "inventory": 200,
                 "unit": "mL",
                 "min_threshold": 500,
-                "expiry_date": (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d"),
+                "expiry_date": (date.today() + timedelta(days=365)).isoformat(),
                 "location": "Almacén de solventes",
                 "safety_info": "Tóxico e inflamable. Usar en campana de extracción.",
                 "supplier": "Sigma-Aldrich"
@@ -692,7 +968,7 @@ class LaboratorySystem:
                 "inventory": 3500,
                 "unit": "mL",
                 "min_threshold": 800,
-                "expiry_date": (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%d"),
+                "expiry_date": (date.today() + timedelta(days=730)).isoformat(),
                 "location": "Almacén de solventes",
                 "safety_info": "Inflamable y volátil. Mantener contenedor cerrado.",
                 "supplier": "Merck"
@@ -808,7 +1084,7 @@ def input_date(prompt):
             return None
         
         try:
-            datetime.strptime(date_str, "%Y-%m-%d")
+            _parse_date(date_str)
             return date_str
         except ValueError:
             print("Error: La fecha debe tener el formato YYYY-MM-DD (ejemplo: 2023-12-31)")
@@ -852,6 +1128,27 @@ def input_yes_no(prompt):
             print("Error: Responda 's' para sí o 'n' para no")
 
 
+def input_json(first_line):
+    """
+    Lee un objeto JSON pegado en la terminal, que puede ocupar varias líneas.
+    
+    Args:
+        first_line: Primera línea ya leída (debe comenzar con '{')
+        
+    Returns:
+        dict: El objeto leído
+    """
+    text = first_line
+    while True:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            line = input("... (línea en blanco para terminar): ")
+            if not line:
+                raise ValueError(f"JSON incompleto o no válido: {e}")
+            text += "\n" + line
+
+
 def pause():
     """Pausa la ejecución hasta que el usuario presione Enter."""
     input("\nPresione Enter para continuar...")
@@ -876,26 +1173,12 @@ def menu_reagents(lab):
         
         option = input("\nSeleccione una opción: ")
         
-        if option == "1":
-            add_reagent(lab)
-        elif option == "2":
-            view_reagents(lab)
-        elif option == "3":
-            update_inventory(lab)
-        elif option == "4":
-            menu_suppliers(lab)
-        elif option == "5":
-            place_order(lab)
-        elif option == "6":
-            receive_order(lab)
-        elif option == "7":
-            inventory_report(lab)
-        elif option == "8":
-            view_low_stock(lab)
-        elif option == "9":
-            view_expired(lab)
-        elif option == "0":
+        if option == "0":
             break
+        
+        action = _REAGENT_ACTIONS.get(option)
+        if action:
+            action(lab)
         else:
             print("Opción no válida")
             pause()
@@ -912,14 +1195,12 @@ def menu_recipes(lab):
         
         option = input("\nSeleccione una opción: ")
         
-        if option == "1":
-            add_recipe(lab)
-        elif option == "2":
-            view_recipes(lab)
-        elif option == "3":
-            validate_recipe(lab)
-        elif option == "0":
+        if option == "0":
             break
+        
+        action = _RECIPE_ACTIONS.get(option)
+        if action:
+            action(lab)
         else:
             print("Opción no válida")
             pause()
@@ -936,14 +1217,12 @@ def menu_experiments(lab):
         
         option = input("\nSeleccione una opción: ")
         
-        if option == "1":
-            perform_experiment(lab)
-        elif option == "2":
-            view_experiments(lab)
-        elif option == "3":
-            experiment_statistics(lab)
-        elif option == "0":
+        if option == "0":
             break
+        
+        action = _EXPERIMENT_ACTIONS.get(option)
+        if action:
+            action(lab)
         else:
             print("Opción no válida")
             pause()
@@ -960,14 +1239,12 @@ def menu_suppliers(lab):
         
         option = input("\nSeleccione una opción: ")
         
-        if option == "1":
-            add_supplier(lab)
-        elif option == "2":
-            view_suppliers(lab)
-        elif option == "3":
-            associate_supplier(lab)
-        elif option == "0":
+        if option == "0":
             break
+        
+        action = _SUPPLIER_ACTIONS.get(option)
+        if action:
+            action(lab)
         else:
             print("Opción no válida")
             pause()
@@ -1012,6 +1289,33 @@ def add_reagent(lab):
         pause()
 
 
+def format_reagent(reagent, show_safety=False):
+    """
+    Devuelve la ficha de un reactivo como un único bloque de texto.
+    
+    Args:
+        reagent: Reactivo a mostrar
+        show_safety: Si es True, incluye la información de seguridad
+        
+    Returns:
+        str: Ficha del reactivo terminada en una línea en blanco
+    """
+    lines = [
+        f"{reagent.name}:",
+        f"  Descripción: {reagent.description}",
+        f"  Costo: {reagent.cost}",
+        f"  Categoría: {reagent.category}",
+        f"  Inventario: {reagent.inventory} {reagent.unit}",
+        f"  Umbral mínimo: {reagent.min_threshold}",
+        f"  Fecha de vencimiento: {reagent.expiry_date}",
+        f"  Ubicación: {reagent.location}",
+    ]
+    if show_safety:
+        lines.append(f"  Información de seguridad: {reagent.safety_info}")
+    
+    return "\n".join(lines) + "\n\n"
+
+
 def view_reagents(lab):
     """Muestra la lista de reactivos."""
     print_header("REACTIVOS")
@@ -1019,17 +1323,10 @@ def view_reagents(lab):
     if not lab.reagents:
         print("No hay reactivos registrados.")
     else:
-        for name, reagent in lab.reagents.items():
-            print(f"{name}:")
-            print(f"  Descripción: {reagent.description}")
-            print(f"  Costo: {reagent.cost}")
-            print(f"  Categoría: {reagent.category}")
-            print(f"  Inventario: {reagent.inventory} {reagent.unit}")
-            print(f"  Umbral mínimo: {reagent.min_threshold}")
-            print(f"  Fecha de vencimiento: {reagent.expiry_date}")
-            print(f"  Ubicación: {reagent.location}")
-            print(f"  Información de seguridad: {reagent.safety_info}")
-            print()
+        # Una sola escritura para toda la lista
+        sys.stdout.write("".join(
+            format_reagent(reagent, show_safety=True) for reagent in lab.reagents.values()
+        ))
     
     pause()
 
@@ -1065,16 +1362,7 @@ def view_low_stock(lab):
     if not low_stock:
         print("No hay reactivos con bajo stock.")
     else:
-        for reagent in low_stock:
-            print(f"{reagent.name}:")
-            print(f"  Descripción: {reagent.description}")
-            print(f"  Costo: {reagent.cost}")
-            print(f"  Categoría: {reagent.category}")
-            print(f"  Inventario: {reagent.inventory} {reagent.unit}")
-            print(f"  Umbral mínimo: {reagent.min_threshold}")
-            print(f"  Fecha de vencimiento: {reagent.expiry_date}")
-            print(f"  Ubicación: {reagent.location}")
-            print()
+        sys.stdout.write("".join(format_reagent(reagent) for reagent in low_stock))
     
     pause()
 
@@ -1087,16 +1375,7 @@ def view_expired(lab):
     if not expired:
         print("No hay reactivos vencidos.")
     else:
-        for reagent in expired:
-            print(f"{reagent.name}:")
-            print(f"  Descripción: {reagent.description}")
-            print(f"  Costo: {reagent.cost}")
-            print(f"  Categoría: {reagent.category}")
-            print(f"  Inventario: {reagent.inventory} {reagent.unit}")
-            print(f"  Umbral mínimo: {reagent.min_threshold}")
-            print(f"  Fecha de vencimiento: {reagent.expiry_date}")
-            print(f"  Ubicación: {reagent.location}")
-            print()
+        sys.stdout.write("".join(format_reagent(reagent) for reagent in expired))
     
     pause()
 
@@ -1111,7 +1390,7 @@ def view_suppliers(lab):
         for name, supplier in lab.suppliers.items():
             print(f"{name}:")
             print(f"  Contacto: {supplier['contact_info']}")
-            print(f"  Reactivos asociados: {', '.join(supplier['reagents'])}")
+            print(f"  Reactivos asociados: {', '.join(sorted(supplier['reagents']))}")
             print()
     
     pause()
@@ -1202,7 +1481,7 @@ def view_experiments(lab):
         print("No hay experimentos registrados.")
     else:
         for experiment in lab.experiments:
-            print(f"{experiment.recipe.name} - Fecha: {experiment.date.strftime('%Y-%m-%d')}")
+            print(f"{experiment.recipe.name} - Fecha: {experiment.date.date().isoformat()}")
             print(f"Responsables: {', '.join(experiment.responsible_people)}")
             print()
     
@@ -1234,7 +1513,8 @@ def validate_recipe(lab):
     recipe = lab.recipes[recipe_name]
     
     # Verificar disponibilidad de reactivos
-    available_reagents = {name: reagent for name, reagent in lab.reagents.items() if not reagent.is_expired()}
+    today = date.today()
+    available_reagents = {name: reagent for name, reagent in lab.reagents.items() if not reagent.is_expired(today)}
     if not recipe.validate_reagents(available_reagents):
         print("Error: No hay suficientes reactivos disponibles o algunos están vencidos")
         return
@@ -1251,32 +1531,40 @@ def add_recipe(lab):
     print_header("AÑADIR RECETA")
     
     try:
-        name = input("Nombre: ")
-        objective = input("Objetivo: ")
-        reagents = {}
-        while True:
-            reagent_name = input("Nombre del reactivo (dejar en blanco para terminar): ")
-            if not reagent_name:
-                break
-            amount = input_float(f"Cantidad de {reagent_name}: ")
-            reagents[reagent_name] = amount
-        
-        expected_results = {}
-        while True:
-            measurement = input("Nombre de la medición (dejar en blanco para terminar): ")
-            if not measurement:
-                break
-            value = input_float(f"Valor esperado para {measurement}: ")
-            expected_results[measurement] = value
-        
-        procedure = []
-        while True:
-            step = input("Descripción del paso (dejar en blanco para terminar): ")
-            if not step:
-                break
-            procedure.append(step)
+        name = input("Nombre (o pegue la receta completa en JSON): ")
+        if name.lstrip().startswith("{"):
+            # Entrada masiva: mismo formato que Recipe.to_dict
+            try:
+                recipe = Recipe.from_dict(input_json(name))
+            except KeyError as e:
+                raise ValueError(f"Falta el campo {e} en la receta") from None
+        else:
+            objective = input("Objetivo: ")
+            reagents = {}
+            while True:
+                reagent_name = input("Nombre del reactivo (dejar en blanco para terminar): ")
+                if not reagent_name:
+                    break
+                amount = input_float(f"Cantidad de {reagent_name}: ")
+                reagents[reagent_name] = amount
+            
+            expected_results = {}
+            while True:
+                measurement = input("Nombre de la medición (dejar en blanco para terminar): ")
+                if not measurement:
+                    break
+                value = input_float(f"Valor esperado para {measurement}: ")
+                expected_results[measurement] = value
+            
+            procedure = []
+            while True:
+                step = input("Descripción del paso (dejar en blanco para terminar): ")
+                if not step:
+                    break
+                procedure.append(step)
+            
+            recipe = Recipe(name, objective, reagents, expected_results, procedure)
         
-        recipe = Recipe(name, objective, reagents, expected_results, procedure)
         result = lab.add_recipe(recipe)
         print(result)
     except Exception as e:
@@ -1314,23 +1602,31 @@ def perform_experiment(lab):
     
     recipe = lab.recipes[recipe_name]
     
-    # Verificar disponibilidad de reactivos
+    # Verificar disponibilidad de reactivos, informando todos los problemas a la vez
+    today = date.today()
+    errors = []
     for reagent_name, amount in recipe.reagents.items():
-        if reagent_name not in lab.reagents:
-            print(f"Error: Reactivo '{reagent_name}' no disponible")
-            return
+        reagent = lab.reagents.get(reagent_name)
+        if reagent is None:
+            errors.append(f"Error: Reactivo '{reagent_name}' no disponible")
+            continue
         
-        reagent = lab.reagents[reagent_name]
         if reagent.inventory < amount:
-            print(f"Error: Inventario insuficiente de '{reagent_name}'")
-            return
+            errors.append(f"Error: Inventario insuficiente de '{reagent_name}'")
         
-        if reagent.is_expired():
-            print(f"Error: Reactivo '{reagent_name}' vencido")
-            return
+        if reagent.is_expired(today):
+            errors.append(f"Error: Reactivo '{reagent_name}' vencido")
+    
+    if errors:
+        print("\n".join(errors))
+        return
     
     # Solicitar información del experimento
-    responsible_people = input("Responsables (separados por comas): ").split(',')
+    responsible_people = [
+        person.strip()
+        for person in input("Responsables (separados por comas): ").split(',')
+        if person.strip()
+    ]
     measurements = {}
     while True:
         measurement = input("Nombre de la medición (dejar en blanco para terminar): ")
@@ -1348,6 +1644,64 @@ def perform_experiment(lab):
     pause()
 
 
+def save_data(lab):
+    """Guarda los datos del sistema en un archivo."""
+    filename = input("Nombre del archivo (data/laboratory_data.json): ") or "data/laboratory_data.json"
+    result = lab.save_data(filename)
+    print(result)
+    pause()
+
+
+def load_data(lab):
+    """Carga los datos del sistema desde un archivo."""
+    filename = input("Nombre del archivo (data/laboratory_data.json): ") or "data/laboratory_data.json"
+    result = lab.load_data(filename)
+    print(result)
+    pause()
+
+
+# Tablas de despacho de los menús (opción -> función); "0" vuelve atrás
+
+_REAGENT_ACTIONS = {
+    "1": add_reagent,
+    "2": view_reagents,
+    "3": update_inventory,
+    "4": menu_suppliers,
+    "5": place_order,
+    "6": receive_order,
+    "7": inventory_report,
+    "8": view_low_stock,
+    "9": view_expired,
+}
+
+_RECIPE_ACTIONS = {
+    "1": add_recipe,
+    "2": view_recipes,
+    "3": validate_recipe,
+}
+
+_EXPERIMENT_ACTIONS = {
+    "1": perform_experiment,
+    "2": view_experiments,
+    "3": experiment_statistics,
+}
+
+_SUPPLIER_ACTIONS = {
+    "1": add_supplier,
+    "2": view_suppliers,
+    "3": associate_supplier,
+}
+
+_MAIN_ACTIONS = {
+    "1": menu_reagents,
+    "2": menu_recipes,
+    "3": menu_experiments,
+    "4": menu_suppliers,
+    "5": save_data,
+    "6": load_data,
+}
+
+
 def main():
     """Función principal del programa."""
     lab = LaboratorySystem()
@@ -1375,26 +1729,12 @@ def main():
         
         option = input("\nSeleccione una opción: ")
         
-        if option == "1":
-            menu_reagents(lab)
-        elif option == "2":
-            menu_recipes(lab)
-        elif option == "3":
-            menu_experiments(lab)
-        elif option == "4":
-            menu_suppliers(lab)
-        elif option == "5":
-            filename = input("Nombre del archivo (data/laboratory_data.json): ") or "data/laboratory_data.json"
-            result = lab.save_data(filename)
-            print(result)
-            pause()
-        elif option == "6":
-            filename = input("Nombre del archivo (data/laboratory_data.json): ") or "data/laboratory_data.json"
-            result = lab.load_data(filename)
-            print(result)
-            pause()
-        elif option == "0":
+        if option == "0":
             break
+        
+        action = _MAIN_ACTIONS.get(option)
+        if action:
+            action(lab)
         else:
             print("Opción no válida")
             pause()